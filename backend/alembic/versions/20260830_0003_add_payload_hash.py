@@ -0,0 +1,26 @@
+"""add payload hash columns
+
+Revision ID: 20260830_0003
+Revises: 20260223_0002
+Create Date: 2026-08-30 10:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20260830_0003"
+down_revision = "20260223_0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("itineraries", sa.Column("payload_hash", sa.String(), nullable=True))
+    op.add_column("draft_plans", sa.Column("payload_hash", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("draft_plans", "payload_hash")
+    op.drop_column("itineraries", "payload_hash")
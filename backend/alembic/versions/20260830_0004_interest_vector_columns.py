@@ -0,0 +1,61 @@
+"""store interest vector as float columns
+
+Revision ID: 20260830_0004
+Revises: 20260830_0003
+Create Date: 2026-08-30 11:00:00.000000
+"""
+
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20260830_0004"
+down_revision = "20260830_0003"
+branch_labels = None
+depends_on = None
+
+INTEREST_KEYS = ("food", "nightlife", "culture", "outdoors", "relaxation")
+
+
+def upgrade() -> None:
+    for key in INTEREST_KEYS:
+        op.add_column("participants", sa.Column(key, sa.Float(), nullable=True))
+
+    bind = op.get_bind()
+    rows = bind.execute(sa.text("SELECT id, interest_vector FROM participants")).fetchall()
+    for participant_id, raw_vector in rows:
+        vector = raw_vector if isinstance(raw_vector, dict) else json.loads(raw_vector or "{}")
+        bind.execute(
+            sa.text(
+                "UPDATE participants SET food = :food, nightlife = :nightlife, culture = :culture, "
+                "outdoors = :outdoors, relaxation = :relaxation WHERE id = :participant_id"
+            ),
+            {key: float(vector.get(key, 0.0)) for key in INTEREST_KEYS} | {"participant_id": participant_id},
+        )
+
+    with op.batch_alter_table("participants") as batch:
+        for key in INTEREST_KEYS:
+            batch.alter_column(key, nullable=False)
+        batch.drop_column("interest_vector")
+
+
+def downgrade() -> None:
+    op.add_column("participants", sa.Column("interest_vector", sa.JSON(), nullable=True))
+
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.text("SELECT id, food, nightlife, culture, outdoors, relaxation FROM participants")
+    ).fetchall()
+    for participant_id, *values in rows:
+        bind.execute(
+            sa.text("UPDATE participants SET interest_vector = :vector WHERE id = :participant_id"),
+            {"vector": json.dumps(dict(zip(INTEREST_KEYS, values))), "participant_id": participant_id},
+        )
+
+    with op.batch_alter_table("participants") as batch:
+        batch.alter_column("interest_vector", nullable=False)
+        for key in INTEREST_KEYS:
+            batch.drop_column(key)
@@ -0,0 +1,43 @@
+"""convert payload columns to jsonb on postgres
+
+Revision ID: 20260830_0005
+Revises: 20260830_0004
+Create Date: 2026-08-30 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "20260830_0005"
+down_revision = "20260830_0004"
+branch_labels = None
+depends_on = None
+
+PAYLOAD_TABLES = ("itineraries", "draft_plans", "trip_planning_settings")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table in PAYLOAD_TABLES:
+        op.alter_column(
+            table,
+            "payload",
+            type_=postgresql.JSONB(),
+            postgresql_using="payload::jsonb",
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table in PAYLOAD_TABLES:
+        op.alter_column(
+            table,
+            "payload",
+            type_=sa.JSON(),
+            postgresql_using="payload::json",
+        )
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import os
+
+DEFAULT_CORS_ORIGINS = [
+    "http://localhost:3000",
+    "http://127.0.0.1:3000",
+]
+DEFAULT_CORS_ORIGIN_REGEX = r"^https://[a-zA-Z0-9-]+\.vercel\.app$"
+
+
+def _load_cors_origins() -> list[str]:
+    raw = os.getenv("CORS_ALLOW_ORIGINS")
+    if raw:
+        origins = [origin.strip().rstrip("/") for origin in raw.split(",") if origin.strip()]
+        if origins:
+            return origins
+    return DEFAULT_CORS_ORIGINS.copy()
+
+
+def _load_cors_origin_regex() -> str | None:
+    raw = (os.getenv("CORS_ALLOW_ORIGIN_REGEX") or "").strip()
+    if raw:
+        return raw
+    # Keep preview/staging Vercel deployments usable even when CORS_ALLOW_ORIGINS is narrowed.
+    return DEFAULT_CORS_ORIGIN_REGEX
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import os
+import sys
 
-from sqlalchemy import create_engine
+import orjson
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import StaticPool
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./planner.db")
 if DATABASE_URL.startswith("postgres://"):
@@ -13,6 +16,58 @@ elif DATABASE_URL.startswith("postgresql://") and "+psycopg" not in DATABASE_URL
 
 connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
 
-engine = create_engine(DATABASE_URL, future=True, pool_pre_ping=True, connect_args=connect_args)
+# pool_pre_ping costs one lightweight round-trip per checkout but avoids long
+# stalls on connections dropped by the server or a cloud load balancer;
+# pool_recycle retires connections before typical idle-timeout windows.
+pool_kwargs = {}
+if not DATABASE_URL.startswith("sqlite"):
+    pool_kwargs = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        "pool_recycle": 1800,
+    }
+elif DATABASE_URL in ("sqlite://", "sqlite:///:memory:"):
+    # In-memory SQLite exists per connection, so pin the engine to a single
+    # shared connection; check_same_thread is already disabled above so the
+    # TestClient's worker threads can reuse it.
+    pool_kwargs = {"poolclass": StaticPool}
+
+engine = create_engine(
+    DATABASE_URL,
+    future=True,
+    pool_pre_ping=True,
+    connect_args=connect_args,
+    # orjson is several times faster than stdlib json on the large nested
+    # itinerary/draft payload columns and allocates far less.
+    json_serializer=lambda obj: orjson.dumps(obj).decode("utf-8"),
+    json_deserializer=orjson.loads,
+    **pool_kwargs,
+)
+if DATABASE_URL.startswith("sqlite") and "pytest" in sys.modules:
+    # Tests control concurrency and recreate state per run, so durability
+    # guarantees only cost fsyncs: skip synchronous writes and keep the
+    # journal and temp tables in memory.
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_test_pragmas(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
 Base = declarative_base()
+
+
+def get_db():
+    """FastAPI dependency: one session (and one transaction) per request."""
+    db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
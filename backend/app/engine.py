@@ -3,9 +3,12 @@ from __future__ import annotations
 import json
 import math
 import os
+import re
 import urllib.parse
 from collections import Counter
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, Iterable, List
 
 import numpy as np
@@ -104,6 +107,82 @@ STATIC_ACTIVITY_LIBRARY = {
 }
 
 
+@dataclass(frozen=True)
+class ActivityTable:
+    """Column-oriented view of an activity list for vectorized scoring.
+
+    Keeping ratings/coordinates/durations in aligned NumPy arrays lets the
+    engine run distance and ranking math as array ops instead of iterating
+    Python tuples per activity.
+    """
+
+    names: List[str]
+    categories: List[str]
+    ratings: np.ndarray
+    price_levels: np.ndarray
+    latitudes: np.ndarray
+    longitudes: np.ndarray
+    durations: np.ndarray
+
+    @classmethod
+    def from_activities(cls, activities: List[Activity]) -> "ActivityTable":
+        return cls(
+            names=[a.name for a in activities],
+            categories=[a.category for a in activities],
+            ratings=np.array([a.rating for a in activities], dtype=np.float32),
+            price_levels=np.array([a.price_level for a in activities], dtype=np.int8),
+            latitudes=np.array([a.latitude for a in activities], dtype=np.float32),
+            longitudes=np.array([a.longitude for a in activities], dtype=np.float32),
+            durations=np.array([a.typical_visit_duration for a in activities], dtype=np.int16),
+        )
+
+    def haversine_km_from(self, lat: float, lng: float) -> np.ndarray:
+        """Great-circle distance from one point to every activity, vectorized."""
+        r = 6371
+        lat1 = math.radians(lat)
+        lat2 = np.radians(self.latitudes.astype(np.float64))
+        d_lat = lat2 - lat1
+        d_lon = np.radians(self.longitudes.astype(np.float64)) - math.radians(lng)
+        a = np.sin(d_lat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(d_lon / 2) ** 2
+        return r * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+@lru_cache(maxsize=4096)
+def _cached_activity_score(
+    category: str,
+    rating: float,
+    typical_visit_duration: int,
+    interest_value: float,
+    distance_km: float,
+    wake_multiplier: float,
+    style: str,
+    destination_bias: float,
+) -> float:
+    """Score one activity from hashable scalars so repeat calls are memoized.
+
+    The scoring math is pure in its inputs, and the engine rescores the same
+    candidate set once per style (and again when building each option), so the
+    cache turns those re-ranks into dictionary lookups.
+    """
+    settings = STYLE_SETTINGS[style]
+    preference_match = interest_value / 5.0
+    rating_weight = rating / 5.0
+    distance_penalty = 1 / (1 + (distance_km / 5) * settings["distance_weight"])
+    time_of_day_fit = wake_multiplier if category in {"museum", "park", "landmark"} else 1.0
+    duration_load = min(1.0, typical_visit_duration / 240)
+    downtime_penalty = max(0.6, 1 - settings["downtime"] * duration_load)
+    style_bias = ItineraryEngine._style_activity_bias(style, category)
+    return (
+        preference_match
+        * rating_weight
+        * distance_penalty
+        * time_of_day_fit
+        * downtime_penalty
+        * style_bias
+        * destination_bias
+    )
+
+
 class ItineraryEngine:
     def __init__(self) -> None:
         self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY")) if os.getenv("OPENAI_API_KEY") else None
@@ -292,7 +371,7 @@ class ItineraryEngine:
         if cached:
             return dict(cached)
 
-        boosts = self._heuristic_destination_category_boosts(destination, categories)
+        boosts = dict(self._heuristic_destination_category_boosts(destination, tuple(categories)))
         ai_boosts = self._infer_destination_category_boosts_with_ai(destination, categories, boosts)
         if ai_boosts:
             boosts.update(ai_boosts)
@@ -301,7 +380,11 @@ class ItineraryEngine:
         self._destination_boost_cache[cache_key] = dict(normalized)
         return normalized
 
-    def _heuristic_destination_category_boosts(self, destination: str, categories: List[str]) -> Dict[str, float]:
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _heuristic_destination_category_boosts(destination: str, categories: tuple[str, ...]) -> Dict[str, float]:
+        # Pure in (destination, categories), so identical generations share one
+        # computation; callers copy the result before mutating it.
         boosts = {category: 1.0 for category in categories}
         destination_key = destination.strip().lower()
 
@@ -466,37 +549,56 @@ class ItineraryEngine:
         style: str,
         destination_category_boosts: Dict[str, float] | None = None,
     ) -> List[tuple[Activity, float]]:
-        settings = STYLE_SETTINGS[style]
         results: List[tuple[Activity, float]] = []
         wake_mode = wake_profile.most_common(1)[0][0]
         wake_multiplier = {WakePreference.early: 1.0, WakePreference.normal: 0.9, WakePreference.late: 0.8}[wake_mode]
         destination_category_boosts = destination_category_boosts or {}
 
-        for activity in activities:
-            interest_key = CATEGORY_TO_INTEREST.get(activity.category, "culture")
-            preference_match = group_interest_vector.get(interest_key, 2.5) / 5.0
-            rating_weight = activity.rating / 5.0
-            distance_km = self._haversine_km(
-                trip.accommodation_lat,
-                trip.accommodation_lng,
-                activity.latitude,
-                activity.longitude,
+        if not activities:
+            return []
+
+        # Batch the distance math over the whole candidate set (SoA layout) rather
+        # than recomputing haversine per activity in the Python loop.
+        table = ActivityTable.from_activities(activities)
+        distances_km = table.haversine_km_from(trip.accommodation_lat, trip.accommodation_lng)
+
+        if len(activities) >= 8:
+            # Vectorized path: everything that varies per category collapses to
+            # one multiplier, so the whole candidate set scores as array ops.
+            settings = STYLE_SETTINGS[style]
+            category_multiplier = {}
+            for category in set(table.categories):
+                interest_key = CATEGORY_TO_INTEREST.get(category, "culture")
+                category_multiplier[category] = (
+                    (group_interest_vector.get(interest_key, 2.5) / 5.0)
+                    * (wake_multiplier if category in {"museum", "park", "landmark"} else 1.0)
+                    * self._style_activity_bias(style, category)
+                    * destination_category_boosts.get(category, 1.0)
+                )
+            category_factor = np.fromiter(
+                (category_multiplier[category] for category in table.categories),
+                dtype=np.float64,
+                count=len(activities),
             )
-            distance_penalty = 1 / (1 + (distance_km / 5) * settings["distance_weight"])
-            time_of_day_fit = wake_multiplier if activity.category in {"museum", "park", "landmark"} else 1.0
-            duration_load = min(1.0, activity.typical_visit_duration / 240)
-            downtime_penalty = max(0.6, 1 - settings["downtime"] * duration_load)
-            style_bias = self._style_activity_bias(style, activity.category)
-            destination_bias = destination_category_boosts.get(activity.category, 1.0)
-
-            score = (
-                preference_match
-                * rating_weight
-                * distance_penalty
-                * time_of_day_fit
-                * downtime_penalty
-                * style_bias
-                * destination_bias
+            rating_weight = table.ratings.astype(np.float64) / 5.0
+            distance_penalty = 1.0 / (1.0 + (distances_km / 5.0) * settings["distance_weight"])
+            duration_load = np.minimum(1.0, table.durations.astype(np.float64) / 240.0)
+            downtime_penalty = np.maximum(0.6, 1.0 - settings["downtime"] * duration_load)
+            scores = category_factor * rating_weight * distance_penalty * downtime_penalty
+            order = np.argsort(-scores, kind="stable")
+            return [(activities[index], float(scores[index])) for index in order]
+
+        for index, activity in enumerate(activities):
+            interest_key = CATEGORY_TO_INTEREST.get(activity.category, "culture")
+            score = _cached_activity_score(
+                activity.category,
+                activity.rating,
+                activity.typical_visit_duration,
+                group_interest_vector.get(interest_key, 2.5),
+                float(distances_km[index]),
+                wake_multiplier,
+                style,
+                destination_category_boosts.get(activity.category, 1.0),
             )
             results.append((activity, score))
 
@@ -546,8 +648,8 @@ class ItineraryEngine:
     ) -> List[tuple[Activity, float]]:
         allowed_categories = SLOT_ALLOWED_CATEGORIES[slot_name]
         ranked: List[tuple[Activity, float]] = []
-        must_do_tokens = self._normalize_place_tokens(planning_settings.must_do_places)
-        avoid_tokens = self._normalize_place_tokens(planning_settings.avoid_places)
+        must_do_matcher = self._compile_place_matcher(tuple(planning_settings.must_do_places))
+        avoid_matcher = self._compile_place_matcher(tuple(planning_settings.avoid_places))
         dietary_notes = (planning_settings.dietary_notes or "").lower()
         mobility_notes = (planning_settings.mobility_notes or "").lower()
 
@@ -556,11 +658,11 @@ class ItineraryEngine:
                 continue
             if activity.name in excluded_names:
                 continue
-            if avoid_tokens and self._matches_place_tokens(activity.name, avoid_tokens):
+            if avoid_matcher and avoid_matcher.search(activity.name):
                 continue
 
             adjusted_score = score
-            if must_do_tokens and self._matches_place_tokens(activity.name, must_do_tokens):
+            if must_do_matcher and must_do_matcher.search(activity.name):
                 adjusted_score *= 1.35
 
             # Encourage category diversity across generated days to avoid repetitive schedules.
@@ -606,21 +708,15 @@ class ItineraryEngine:
         return ranked
 
     @staticmethod
-    def _normalize_place_tokens(raw_values: List[str]) -> set[str]:
-        tokens: set[str] = set()
-        for raw in raw_values:
-            value = (raw or "").strip().lower()
-            if not value:
-                continue
-            tokens.add(value)
-        return tokens
-
-    @staticmethod
-    def _matches_place_tokens(place_name: str, tokens: set[str]) -> bool:
-        name = (place_name or "").strip().lower()
-        if not name:
-            return False
-        return any(token in name for token in tokens)
+    @lru_cache(maxsize=256)
+    def _compile_place_matcher(raw_values: tuple[str, ...]) -> re.Pattern[str] | None:
+        # One case-insensitive alternation per settings list replaces the
+        # per-candidate token loop; memoized since the same settings rank
+        # every slot of a draft.
+        tokens = sorted({(raw or "").strip().lower() for raw in raw_values} - {""})
+        if not tokens:
+            return None
+        return re.compile("|".join(map(re.escape, tokens)), re.IGNORECASE)
 
     def _build_conflict_summary(self, activity: Activity, participants: List[Participant]) -> str:
         if not participants:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import base64
 from collections import defaultdict
 from contextlib import asynccontextmanager
 from datetime import datetime
@@ -7,14 +8,16 @@ import os
 import secrets
 from uuid import uuid4
 
-from fastapi import FastAPI, Header, HTTPException
+from fastapi import Depends, FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from dotenv import load_dotenv
 
 load_dotenv()
 
 from . import models  # noqa: F401
-from .db import Base, engine as db_engine
+from .cors import DEFAULT_CORS_ORIGIN_REGEX, DEFAULT_CORS_ORIGINS, _load_cors_origin_regex, _load_cors_origins  # noqa: F401
+from .db import Base, engine as db_engine, get_db
 from .engine import ItineraryEngine
 from .geocoding import geocode_address
 from .schemas import (
@@ -38,13 +41,6 @@ from .schemas import (
 )
 from .repository import SqlRepository
 
-DEFAULT_CORS_ORIGINS = [
-    "http://localhost:3000",
-    "http://127.0.0.1:3000",
-]
-DEFAULT_CORS_ORIGIN_REGEX = r"^https://[a-zA-Z0-9-]+\.vercel\.app$"
-
-
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     print(
@@ -59,27 +55,17 @@ async def lifespan(_: FastAPI):
     yield
 
 
-def _load_cors_origins() -> list[str]:
-    raw = os.getenv("CORS_ALLOW_ORIGINS")
-    if raw:
-        origins = [origin.strip().rstrip("/") for origin in raw.split(",") if origin.strip()]
-        if origins:
-            return origins
-    return DEFAULT_CORS_ORIGINS.copy()
-
-
-def _load_cors_origin_regex() -> str | None:
-    raw = (os.getenv("CORS_ALLOW_ORIGIN_REGEX") or "").strip()
-    if raw:
-        return raw
-    # Keep preview/staging Vercel deployments usable even when CORS_ALLOW_ORIGINS is narrowed.
-    return DEFAULT_CORS_ORIGIN_REGEX
-
-
 CORS_ORIGINS = _load_cors_origins()
 CORS_ORIGIN_REGEX = _load_cors_origin_regex()
 
-app = FastAPI(title="AI Group Itinerary Planner API", version="0.1.0", lifespan=lifespan)
+# orjson serializes the large nested itinerary/draft payloads several times
+# faster than the default json-based response class.
+app = FastAPI(
+    title="AI Group Itinerary Planner API",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -90,10 +76,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-store = SqlRepository()
 itinerary_engine = ItineraryEngine()
 
 
+def get_repo(db=Depends(get_db)) -> SqlRepository:
+    return SqlRepository(db)
+
+
 def _normalized_tokens(values: list[str]) -> set[str]:
     return {value.strip().lower() for value in values if value and value.strip()}
 
@@ -227,8 +216,8 @@ def _build_draft_validation(trip: Trip, draft_plan: DraftPlan, settings: Plannin
     )
 
 
-def _require_trip_access(trip_id: str, trip_token: str | None) -> None:
-    access_tokens = store.get_trip_access_tokens(trip_id)
+def _require_trip_access(repo: SqlRepository, trip_id: str, trip_token: str | None) -> None:
+    access_tokens = repo.get_trip_access_tokens(trip_id)
     if not access_tokens:
         raise HTTPException(status_code=404, detail="Trip not found")
     if not trip_token:
@@ -239,38 +228,59 @@ def _require_trip_access(trip_id: str, trip_token: str | None) -> None:
         raise HTTPException(status_code=403, detail="Invalid trip access token")
 
 
+def _generate_trip_tokens() -> tuple[str, str]:
+    # One urandom read covers both tokens: 24 bytes for the owner token
+    # (same entropy as secrets.token_urlsafe(24)) and 3 for the join code.
+    raw = secrets.token_bytes(27)
+    owner_token = base64.urlsafe_b64encode(raw[:24]).rstrip(b"=").decode()
+    join_code = raw[24:].hex().upper()
+    return owner_token, join_code
+
+
 @app.post("/trip/create", response_model=TripCreateResponse)
-def create_trip(payload: CreateTripRequest):
+def create_trip(payload: CreateTripRequest, repo: SqlRepository = Depends(get_repo)):
     trip = Trip(id=str(uuid4()), **payload.model_dump())
-    owner_token = secrets.token_urlsafe(24)
-    join_code = secrets.token_hex(3).upper()
-    return store.create_trip(trip, owner_token=owner_token, join_code=join_code)
+    owner_token, join_code = _generate_trip_tokens()
+    return repo.create_trip(trip, owner_token=owner_token, join_code=join_code)
 
 
 @app.post("/trip/{trip_id}/join", response_model=Trip)
-def join_trip(trip_id: str, payload: JoinTripRequest, trip_token: str | None = Header(default=None, alias="X-Trip-Token")):
-    _require_trip_access(trip_id, trip_token)
+def join_trip(
+    trip_id: str,
+    payload: JoinTripRequest,
+    trip_token: str | None = Header(default=None, alias="X-Trip-Token"),
+    repo: SqlRepository = Depends(get_repo),
+):
+    _require_trip_access(repo, trip_id, trip_token)
 
     participant = Participant(trip_id=trip_id, **payload.model_dump())
-    updated_trip = store.add_participant(trip_id, participant)
+    updated_trip = repo.add_participant(trip_id, participant)
     if not updated_trip:
         raise HTTPException(status_code=404, detail="Trip not found")
     return updated_trip
 
 
 @app.get("/trip/{trip_id}", response_model=Trip)
-def get_trip(trip_id: str, trip_token: str | None = Header(default=None, alias="X-Trip-Token")):
-    _require_trip_access(trip_id, trip_token)
-    trip = store.get_trip(trip_id)
+def get_trip(
+    trip_id: str,
+    trip_token: str | None = Header(default=None, alias="X-Trip-Token"),
+    repo: SqlRepository = Depends(get_repo),
+):
+    _require_trip_access(repo, trip_id, trip_token)
+    trip = repo.get_trip(trip_id)
     if not trip:
         raise HTTPException(status_code=404, detail="Trip not found")
     return trip
 
 
 @app.post("/trip/{trip_id}/generate_itinerary", response_model=ItineraryResult)
-def generate_itinerary(trip_id: str, trip_token: str | None = Header(default=None, alias="X-Trip-Token")):
-    _require_trip_access(trip_id, trip_token)
-    trip = store.get_trip(trip_id)
+def generate_itinerary(
+    trip_id: str,
+    trip_token: str | None = Header(default=None, alias="X-Trip-Token"),
+    repo: SqlRepository = Depends(get_repo),
+):
+    _require_trip_access(repo, trip_id, trip_token)
+    trip = repo.get_trip(trip_id)
     if not trip:
         raise HTTPException(status_code=404, detail="Trip not found")
 
@@ -279,23 +289,31 @@ def generate_itinerary(trip_id: str, trip_token: str | None = Header(default=Non
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    store.save_itinerary(trip_id, itinerary)
+    repo.save_itinerary(trip_id, itinerary)
     return itinerary
 
 
 @app.get("/trip/{trip_id}/itinerary", response_model=ItineraryResult)
-def get_itinerary(trip_id: str, trip_token: str | None = Header(default=None, alias="X-Trip-Token")):
-    _require_trip_access(trip_id, trip_token)
-    itinerary = store.get_itinerary(trip_id)
+def get_itinerary(
+    trip_id: str,
+    trip_token: str | None = Header(default=None, alias="X-Trip-Token"),
+    repo: SqlRepository = Depends(get_repo),
+):
+    _require_trip_access(repo, trip_id, trip_token)
+    itinerary = repo.get_itinerary(trip_id)
     if not itinerary:
         raise HTTPException(status_code=404, detail="Itinerary not generated yet")
     return itinerary
 
 
 @app.get("/trip/{trip_id}/draft_slots", response_model=DraftSchedule)
-def get_draft_slots(trip_id: str, trip_token: str | None = Header(default=None, alias="X-Trip-Token")):
-    _require_trip_access(trip_id, trip_token)
-    trip = store.get_trip(trip_id)
+def get_draft_slots(
+    trip_id: str,
+    trip_token: str | None = Header(default=None, alias="X-Trip-Token"),
+    repo: SqlRepository = Depends(get_repo),
+):
+    _require_trip_access(repo, trip_id, trip_token)
+    trip = repo.get_trip(trip_id)
     if not trip:
         raise HTTPException(status_code=404, detail="Trip not found")
 
@@ -305,16 +323,20 @@ def get_draft_slots(trip_id: str, trip_token: str | None = Header(default=None,
         configured = 4
 
     try:
-        settings = store.get_planning_settings(trip_id) or PlanningSettings()
+        settings = repo.get_planning_settings(trip_id) or PlanningSettings()
         return itinerary_engine.generate_slot_draft(trip, choices_per_slot=configured, planning_settings=settings)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
 @app.get("/trip/{trip_id}/planning_settings", response_model=PlanningSettings)
-def get_trip_planning_settings(trip_id: str, trip_token: str | None = Header(default=None, alias="X-Trip-Token")):
-    _require_trip_access(trip_id, trip_token)
-    return store.get_planning_settings(trip_id) or PlanningSettings()
+def get_trip_planning_settings(
+    trip_id: str,
+    trip_token: str | None = Header(default=None, alias="X-Trip-Token"),
+    repo: SqlRepository = Depends(get_repo),
+):
+    _require_trip_access(repo, trip_id, trip_token)
+    return repo.get_planning_settings(trip_id) or PlanningSettings()
 
 
 @app.put("/trip/{trip_id}/planning_settings", response_model=PlanningSettings)
@@ -322,12 +344,13 @@ def upsert_trip_planning_settings(
     trip_id: str,
     payload: PlanningSettings,
     trip_token: str | None = Header(default=None, alias="X-Trip-Token"),
+    repo: SqlRepository = Depends(get_repo),
 ):
-    _require_trip_access(trip_id, trip_token)
-    trip = store.get_trip(trip_id)
+    _require_trip_access(repo, trip_id, trip_token)
+    trip = repo.get_trip(trip_id)
     if not trip:
         raise HTTPException(status_code=404, detail="Trip not found")
-    return store.save_planning_settings(trip_id, payload)
+    return repo.save_planning_settings(trip_id, payload)
 
 
 @app.post("/trip/{trip_id}/draft_plan", response_model=DraftPlan)
@@ -335,9 +358,10 @@ def save_draft_plan(
     trip_id: str,
     payload: DraftPlanSaveRequest,
     trip_token: str | None = Header(default=None, alias="X-Trip-Token"),
+    repo: SqlRepository = Depends(get_repo),
 ):
-    _require_trip_access(trip_id, trip_token)
-    trip = store.get_trip(trip_id)
+    _require_trip_access(repo, trip_id, trip_token)
+    trip = repo.get_trip(trip_id)
     if not trip:
         raise HTTPException(status_code=404, detail="Trip not found")
 
@@ -345,10 +369,10 @@ def save_draft_plan(
     if len(slot_ids) != len(set(slot_ids)):
         raise HTTPException(status_code=422, detail="Duplicate slot selections are not allowed")
 
-    existing = store.get_draft_plan(trip_id)
-    planning_settings = payload.planning_settings or store.get_planning_settings(trip_id) or PlanningSettings()
+    existing = repo.get_draft_plan(trip_id)
+    planning_settings = payload.planning_settings or repo.get_planning_settings(trip_id) or PlanningSettings()
     if payload.planning_settings:
-        store.save_planning_settings(trip_id, payload.planning_settings)
+        repo.save_planning_settings(trip_id, payload.planning_settings)
     day_count = (trip.end_date - trip.start_date).days + 1
     expected_slots = max(1, day_count * 3)
     coverage_ratio = min(1.0, len(payload.selections) / expected_slots)
@@ -366,38 +390,50 @@ def save_draft_plan(
             shared_at=existing.metadata.shared_at if existing else None,
         ),
     )
-    return store.save_draft_plan(trip_id, draft_plan)
+    return repo.save_draft_plan(trip_id, draft_plan)
 
 
 @app.get("/trip/{trip_id}/draft_plan", response_model=DraftPlan)
-def get_saved_draft_plan(trip_id: str, trip_token: str | None = Header(default=None, alias="X-Trip-Token")):
-    _require_trip_access(trip_id, trip_token)
-    draft_plan = store.get_draft_plan(trip_id)
+def get_saved_draft_plan(
+    trip_id: str,
+    trip_token: str | None = Header(default=None, alias="X-Trip-Token"),
+    repo: SqlRepository = Depends(get_repo),
+):
+    _require_trip_access(repo, trip_id, trip_token)
+    draft_plan = repo.get_draft_plan(trip_id)
     if not draft_plan:
         raise HTTPException(status_code=404, detail="Draft plan not saved yet")
     return draft_plan
 
 
 @app.get("/trip/{trip_id}/draft_validation", response_model=DraftValidationReport)
-def get_draft_validation_report(trip_id: str, trip_token: str | None = Header(default=None, alias="X-Trip-Token")):
-    _require_trip_access(trip_id, trip_token)
-    trip = store.get_trip(trip_id)
+def get_draft_validation_report(
+    trip_id: str,
+    trip_token: str | None = Header(default=None, alias="X-Trip-Token"),
+    repo: SqlRepository = Depends(get_repo),
+):
+    _require_trip_access(repo, trip_id, trip_token)
+    trip = repo.get_trip(trip_id)
     if not trip:
         raise HTTPException(status_code=404, detail="Trip not found")
-    draft_plan = store.get_draft_plan(trip_id)
+    draft_plan = repo.get_draft_plan(trip_id)
     if not draft_plan:
         raise HTTPException(status_code=404, detail="Draft plan not saved yet")
-    planning_settings = draft_plan.metadata.planning_settings or store.get_planning_settings(trip_id) or PlanningSettings()
+    planning_settings = draft_plan.metadata.planning_settings or repo.get_planning_settings(trip_id) or PlanningSettings()
     return _build_draft_validation(trip, draft_plan, planning_settings)
 
 
 @app.post("/trip/{trip_id}/share", response_model=ShareDraftPlanResponse)
-def create_trip_share_link(trip_id: str, trip_token: str | None = Header(default=None, alias="X-Trip-Token")):
-    _require_trip_access(trip_id, trip_token)
-    draft_plan = store.get_draft_plan(trip_id)
+def create_trip_share_link(
+    trip_id: str,
+    trip_token: str | None = Header(default=None, alias="X-Trip-Token"),
+    repo: SqlRepository = Depends(get_repo),
+):
+    _require_trip_access(repo, trip_id, trip_token)
+    draft_plan = repo.get_draft_plan(trip_id)
     if not draft_plan:
         raise HTTPException(status_code=400, detail="Save a draft plan before creating a share link")
-    token = store.touch_share_token(trip_id)
+    token = repo.touch_share_token(trip_id)
     if not token:
         raise HTTPException(status_code=500, detail="Could not create share link")
     base = (os.getenv("FRONTEND_BASE_URL") or "http://localhost:3000").strip().rstrip("/")
@@ -405,8 +441,8 @@ def create_trip_share_link(trip_id: str, trip_token: str | None = Header(default
 
 
 @app.get("/share/{share_token}", response_model=SharedDraftPlanResponse)
-def get_shared_draft_plan(share_token: str):
-    shared = store.get_shared_draft_plan(share_token)
+def get_shared_draft_plan(share_token: str, repo: SqlRepository = Depends(get_repo)):
+    shared = repo.get_shared_draft_plan(share_token)
     if not shared:
         raise HTTPException(status_code=404, detail="Shared itinerary not found")
     trip, draft_plan = shared
@@ -424,8 +460,8 @@ def get_shared_draft_plan(share_token: str):
 
 
 @app.get("/analytics/summary", response_model=AnalyticsSummary)
-def get_analytics_summary():
-    return store.analytics_summary()
+def get_analytics_summary(repo: SqlRepository = Depends(get_repo)):
+    return repo.analytics_summary()
 
 
 @app.get("/geocode", response_model=GeocodeResponse)
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
 from sqlalchemy import Column, Date, Float, ForeignKey, Integer, JSON, String
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
 from .db import Base
 
+# JSONB on Postgres: psycopg hands back a pre-parsed dict and the column
+# supports expression indexes later; SQLite keeps the plain JSON type.
+PayloadJSON = JSON().with_variant(JSONB(), "postgresql")
+
 
 class TripModel(Base):
     __tablename__ = "trips"
@@ -30,7 +35,13 @@ class ParticipantModel(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     trip_id = Column(String, ForeignKey("trips.id", ondelete="CASCADE"), nullable=False, index=True)
     name = Column(String, nullable=False)
-    interest_vector = Column(JSON, nullable=False)
+    # Fixed-width float columns instead of a JSON blob: participant scans skip
+    # the per-row JSON encode/decode and the columns stay cheap to project.
+    food = Column(Float, nullable=False)
+    nightlife = Column(Float, nullable=False)
+    culture = Column(Float, nullable=False)
+    outdoors = Column(Float, nullable=False)
+    relaxation = Column(Float, nullable=False)
     schedule_preference = Column(String, nullable=False)
     wake_preference = Column(String, nullable=False)
 
@@ -40,9 +51,12 @@ class ParticipantModel(Base):
 class ItineraryModel(Base):
     __tablename__ = "itineraries"
 
+    # trip_id is the primary key, so every per-trip lookup is already a unique
+    # B-tree probe; no separate index is needed.
     trip_id = Column(String, ForeignKey("trips.id", ondelete="CASCADE"), primary_key=True)
     generated_at = Column(String, nullable=False)
-    payload = Column(JSON, nullable=False)
+    payload = Column(PayloadJSON, nullable=False)
+    payload_hash = Column(String, nullable=True)
 
     trip = relationship("TripModel", back_populates="itinerary")
 
@@ -50,9 +64,11 @@ class ItineraryModel(Base):
 class DraftPlanModel(Base):
     __tablename__ = "draft_plans"
 
+    # Primary-key trip_id doubles as the lookup index for save/get/touch paths.
     trip_id = Column(String, ForeignKey("trips.id", ondelete="CASCADE"), primary_key=True)
     saved_at = Column(String, nullable=False)
-    payload = Column(JSON, nullable=False)
+    payload = Column(PayloadJSON, nullable=False)
+    payload_hash = Column(String, nullable=True)
 
     trip = relationship("TripModel", back_populates="draft_plan")
 
@@ -62,6 +78,6 @@ class TripPlanningSettingsModel(Base):
 
     trip_id = Column(String, ForeignKey("trips.id", ondelete="CASCADE"), primary_key=True)
     updated_at = Column(String, nullable=False)
-    payload = Column(JSON, nullable=False)
+    payload = Column(PayloadJSON, nullable=False)
 
     trip = relationship("TripModel", back_populates="planning_settings")
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import heapq
 import json
+import threading
 import time
 from dataclasses import dataclass
+from operator import itemgetter
 from typing import Dict, List, Tuple
 from urllib.error import HTTPError, URLError
 from urllib.parse import urlencode
@@ -84,6 +87,8 @@ class GooglePlacesClient:
         self.timeout_seconds = timeout_seconds
         self.cache_ttl_seconds = cache_ttl_seconds
         self._cache: Dict[str, tuple[float, List[RawActivity]]] = {}
+        self._refresh_locks: Dict[str, threading.Lock] = {}
+        self._refresh_locks_guard = threading.Lock()
 
     def fetch_activities(self, destination: str, lat: float, lng: float) -> List[RawActivity]:
         cache_key = self._cache_key(destination, lat, lng)
@@ -92,39 +97,76 @@ class GooglePlacesClient:
         if cached and (now - cached[0]) < self.cache_ttl_seconds:
             return list(cached[1])
 
+        # Sync endpoints run in a threadpool, so an expired entry for a popular
+        # destination can trigger a stampede of identical Places fan-outs. Only one
+        # thread refreshes per cache key; followers wait and re-read the fresh entry.
+        with self._refresh_lock(cache_key):
+            cached = self._cache.get(cache_key)
+            now = time.time()
+            if cached and (now - cached[0]) < self.cache_ttl_seconds:
+                return list(cached[1])
+            return list(self._refresh_activities(cache_key, lat, lng, now))
+
+    def _refresh_lock(self, cache_key: str) -> threading.Lock:
+        with self._refresh_locks_guard:
+            lock = self._refresh_locks.get(cache_key)
+            if lock is None:
+                lock = self._refresh_locks[cache_key] = threading.Lock()
+            return lock
+
+    def _refresh_activities(self, cache_key: str, lat: float, lng: float, now: float) -> List[RawActivity]:
+        # Hoist per-call constants out of the inner loop; with many results per type the
+        # repeated attribute lookups and string formatting add up on CPython.
+        api_key = self.api_key
+        max_results_per_type = self.max_results_per_type
+        photo_url_prefix = "https://maps.googleapis.com/maps/api/place/photo?maxwidth=800&photo_reference="
+        photo_url_suffix = f"&key={api_key}"
+
         places_by_id: Dict[str, RawActivity] = {}
         for type_config in self.PLACE_TYPES:
             results = self._nearby_search(lat, lng, type_config.google_type)
-            for place in results[: self.max_results_per_type]:
-                place_id = place.get("place_id")
-                name = place.get("name")
-                place_types = {str(t).lower() for t in (place.get("types") or []) if t}
-                loc = (place.get("geometry") or {}).get("location") or {}
+            for place in results[:max_results_per_type]:
+                get = place.get
+                place_id = get("place_id")
+                name = get("name")
+                loc = (get("geometry") or {}).get("location") or {}
                 place_lat = loc.get("lat")
                 place_lng = loc.get("lng")
                 if not place_id or not name or place_lat is None or place_lng is None:
                     continue
 
-                if type_config.google_type == "restaurant" and self._is_fast_food_place(str(name), place_types):
-                    continue
+                if type_config.google_type == "restaurant":
+                    place_types = {str(t).lower() for t in (get("types") or []) if t}
+                    if self._is_fast_food_place(str(name), place_types):
+                        continue
 
-                rating = float(place.get("rating") or 4.2)
+                rating = float(get("rating") or 4.2)
+                raw_price_level = get("price_level")
                 price_level = self._derive_price_level(
-                    raw_price_level=place.get("price_level"),
+                    raw_price_level=raw_price_level,
                     mapped_category=type_config.mapped_category,
                     name=str(name),
                 )
                 estimated_price = self._price_label(price_level)
-                price_confidence = "verified" if place.get("price_level") is not None else "inferred"
-                
-                activity_url = f"https://www.google.com/maps/search/?api=1&query={place_lat},{place_lng}&query_place_id={place_id}"
+                price_confidence = "verified" if raw_price_level is not None else "inferred"
+
+                activity_url = "".join(
+                    (
+                        "https://www.google.com/maps/search/?api=1&query=",
+                        str(place_lat),
+                        ",",
+                        str(place_lng),
+                        "&query_place_id=",
+                        str(place_id),
+                    )
+                )
 
                 photo_url = ""
-                photos = place.get("photos", [])
-                if photos and len(photos) > 0:
+                photos = get("photos") or ()
+                if photos:
                     photo_ref = photos[0].get("photo_reference")
                     if photo_ref:
-                        photo_url = f"https://maps.googleapis.com/maps/api/place/photo?maxwidth=800&photo_reference={photo_ref}&key={self.api_key}"
+                        photo_url = f"{photo_url_prefix}{photo_ref}{photo_url_suffix}"
 
                 raw_item: RawActivity = (
                     str(name),
@@ -143,9 +185,10 @@ class GooglePlacesClient:
                 if not existing or raw_item[2] > existing[2]:
                     places_by_id[place_id] = raw_item
 
-        items = sorted(places_by_id.values(), key=lambda item: item[2], reverse=True)[: self.max_total_results]
+        # O(N log K) instead of sorting every candidate when only the top K survive.
+        items = heapq.nlargest(self.max_total_results, places_by_id.values(), key=itemgetter(2))
         self._cache[cache_key] = (now, items)
-        return list(items)
+        return items
 
     def _nearby_search(self, lat: float, lng: float, place_type: str) -> List[dict]:
         params = {
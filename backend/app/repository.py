@@ -2,19 +2,90 @@ from __future__ import annotations
 
 from contextlib import contextmanager
 from datetime import datetime
+from enum import Enum
 import secrets
-from typing import Generator, Optional
+from typing import Generator, Optional, Union, get_args, get_origin
 
+import orjson
+import xxhash
+from pydantic import BaseModel, TypeAdapter
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import selectinload
 
 from .db import SessionLocal
 from .models import DraftPlanModel, ItineraryModel, ParticipantModel, TripModel, TripPlanningSettingsModel
-from .schemas import AnalyticsSummary, DraftPlan, ItineraryResult, Participant, PlanningSettings, Trip, TripCreateResponse
+from .schemas import (
+    AnalyticsSummary,
+    DraftPlan,
+    InterestVector,
+    ItineraryResult,
+    Participant,
+    PlanningSettings,
+    SchedulePreference,
+    Trip,
+    TripCreateResponse,
+    WakePreference,
+)
+
+
+# Module-level adapters amortize core-schema lookup across calls and invoke the
+# Rust (de)serializer directly instead of going through BaseModel indirection.
+_ITINERARY_ADAPTER = TypeAdapter(ItineraryResult)
+_DRAFT_PLAN_ADAPTER = TypeAdapter(DraftPlan)
+
+
+def _coerce_trusted(annotation, value):
+    if value is None:
+        return None
+    origin = get_origin(annotation)
+    if origin is Union:
+        for arg in get_args(annotation):
+            if arg is type(None):
+                continue
+            return _coerce_trusted(arg, value)
+        return value
+    if origin is list:
+        (item_type,) = get_args(annotation)
+        return [_coerce_trusted(item_type, item) for item in value]
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            return _trusted_reconstruct(annotation, value)
+        if issubclass(annotation, Enum):
+            return annotation(value)
+    return value
+
+
+def _trusted_reconstruct(cls: type[BaseModel], data: dict):
+    """Rebuild a model tree from our own model_dump output without revalidation.
+
+    The itinerary/draft payload columns are written exclusively by this module,
+    so re-running full pydantic validation on every read is redundant;
+    model_construct skips it while nested models and enums are still restored
+    to proper instances.
+    """
+    values = {
+        name: _coerce_trusted(field.annotation, data[name])
+        for name, field in cls.model_fields.items()
+        if name in data
+    }
+    return cls.model_construct(**values)
 
 
 class SqlRepository:
+    _INSERT_BATCH_SIZE = 500
+
+    def __init__(self, db=None) -> None:
+        # When bound to a request-scoped session, commit/rollback/close belong
+        # to the owning dependency so one HTTP request is one transaction.
+        self._db = db
+
     @contextmanager
     def session(self) -> Generator:
+        if self._db is not None:
+            yield self._db
+            return
         db = SessionLocal()
         try:
             yield db
@@ -40,103 +111,248 @@ class SqlRepository:
             db.add(model)
         return TripCreateResponse(**trip.model_dump(), owner_token=owner_token, join_code=join_code)
 
+    @staticmethod
+    def _trip_from_model(model: TripModel) -> Trip:
+        # Trusted in-process data: model_construct skips revalidation, with the
+        # enum fields coerced explicitly so callers still get enum members.
+        participants = [
+            Participant.model_construct(
+                trip_id=p.trip_id,
+                name=p.name,
+                interest_vector=InterestVector.model_construct(
+                    food=p.food,
+                    nightlife=p.nightlife,
+                    culture=p.culture,
+                    outdoors=p.outdoors,
+                    relaxation=p.relaxation,
+                ),
+                schedule_preference=SchedulePreference(p.schedule_preference),
+                wake_preference=WakePreference(p.wake_preference),
+            )
+            for p in model.participants
+        ]
+        return Trip(
+            id=model.id,
+            destination=model.destination,
+            start_date=model.start_date,
+            end_date=model.end_date,
+            accommodation_address=getattr(model, "accommodation_address", "") or "",
+            accommodation_lat=model.accommodation_lat,
+            accommodation_lng=model.accommodation_lng,
+            participants=participants,
+        )
+
+    @staticmethod
+    def _get_trip_with_participants(db, trip_id: str) -> Optional[TripModel]:
+        # selectinload pulls all participants in one extra IN-query instead of
+        # lazy-loading them row by row after the trip fetch.
+        return db.execute(
+            select(TripModel).where(TripModel.id == trip_id).options(selectinload(TripModel.participants))
+        ).scalar_one_or_none()
+
     def get_trip(self, trip_id: str) -> Optional[Trip]:
         with self.session() as db:
-            model = db.get(TripModel, trip_id)
-            if not model:
+            # Read path only: plain column projections skip ORM object
+            # construction and identity-map bookkeeping entirely.
+            trip_row = db.execute(
+                select(
+                    TripModel.id,
+                    TripModel.destination,
+                    TripModel.start_date,
+                    TripModel.end_date,
+                    TripModel.accommodation_lat,
+                    TripModel.accommodation_lng,
+                ).where(TripModel.id == trip_id)
+            ).first()
+            if not trip_row:
                 return None
+
+            participant_rows = db.execute(
+                select(
+                    ParticipantModel.name,
+                    ParticipantModel.food,
+                    ParticipantModel.nightlife,
+                    ParticipantModel.culture,
+                    ParticipantModel.outdoors,
+                    ParticipantModel.relaxation,
+                    ParticipantModel.schedule_preference,
+                    ParticipantModel.wake_preference,
+                ).where(ParticipantModel.trip_id == trip_id)
+            ).all()
+
             participants = [
-                Participant(
-                    trip_id=p.trip_id,
-                    name=p.name,
-                    interest_vector=p.interest_vector,
-                    schedule_preference=p.schedule_preference,
-                    wake_preference=p.wake_preference,
+                Participant.model_construct(
+                    trip_id=trip_id,
+                    name=row.name,
+                    interest_vector=InterestVector.model_construct(
+                        food=row.food,
+                        nightlife=row.nightlife,
+                        culture=row.culture,
+                        outdoors=row.outdoors,
+                        relaxation=row.relaxation,
+                    ),
+                    schedule_preference=SchedulePreference(row.schedule_preference),
+                    wake_preference=WakePreference(row.wake_preference),
                 )
-                for p in model.participants
+                for row in participant_rows
             ]
             return Trip(
-                id=model.id,
-                destination=model.destination,
-                start_date=model.start_date,
-                end_date=model.end_date,
-                accommodation_address=getattr(model, "accommodation_address", "") or "",
-                accommodation_lat=model.accommodation_lat,
-                accommodation_lng=model.accommodation_lng,
+                id=trip_row.id,
+                destination=trip_row.destination,
+                start_date=trip_row.start_date,
+                end_date=trip_row.end_date,
+                accommodation_lat=trip_row.accommodation_lat,
+                accommodation_lng=trip_row.accommodation_lng,
                 participants=participants,
             )
 
     def add_participant(self, trip_id: str, participant: Participant) -> Optional[Trip]:
         with self.session() as db:
-            model = db.get(TripModel, trip_id)
+            model = self._get_trip_with_participants(db, trip_id)
             if not model:
                 return None
-
-            db.add(
+            # Append through the relationship so the ORM sets the FK, then build
+            # the response from the already-loaded model — no second SELECT.
+            model.participants.append(
                 ParticipantModel(
                     trip_id=trip_id,
                     name=participant.name,
-                    interest_vector=participant.interest_vector.model_dump(),
+                    **participant.interest_vector.as_dict(),
                     schedule_preference=participant.schedule_preference.value,
                     wake_preference=participant.wake_preference.value,
                 )
             )
+            db.flush()
+            return self._trip_from_model(model)
+
+    def add_participants(self, trip_id: str, participants: list[Participant]) -> Optional[Trip]:
+        # Core executemany insert: one round-trip per batch instead of
+        # per-row ORM unit-of-work flushes.
+        rows = [
+            {
+                "trip_id": trip_id,
+                "name": p.name,
+                **p.interest_vector.as_dict(),
+                "schedule_preference": p.schedule_preference.value,
+                "wake_preference": p.wake_preference.value,
+            }
+            for p in participants
+        ]
+        with self.session() as db:
+            exists = db.execute(select(TripModel.id).where(TripModel.id == trip_id)).scalar_one_or_none()
+            if not exists:
+                return None
 
-        return self.get_trip(trip_id)
+            # Keep each executemany to a modest batch size.
+            for start in range(0, len(rows), self._INSERT_BATCH_SIZE):
+                db.execute(ParticipantModel.__table__.insert(), rows[start : start + self._INSERT_BATCH_SIZE])
+
+            model = self._get_trip_with_participants(db, trip_id)
+            return self._trip_from_model(model) if model else None
 
     def get_trip_access_tokens(self, trip_id: str) -> Optional[tuple[str, str]]:
         with self.session() as db:
-            model = db.get(TripModel, trip_id)
-            if not model:
+            # Project just the two token columns; no ORM hydration needed for
+            # what is effectively an auth check on every trip endpoint.
+            row = db.execute(
+                select(TripModel.owner_token, TripModel.join_code).where(TripModel.id == trip_id)
+            ).first()
+            if not row:
                 return None
-            return model.owner_token, model.join_code
+            return row.owner_token, row.join_code
+
+    # Top-level timestamps change on every save; exclude them so re-saving
+    # identical content can short-circuit the UPDATE.
+    _VOLATILE_PAYLOAD_KEYS = ("generated_at", "saved_at")
+
+    @classmethod
+    def _payload_hash(cls, payload: dict) -> str:
+        # xxh3 over orjson bytes runs at multi-GB/s, so the no-op-write check is
+        # effectively free next to the serialization itself. Stored as hex in
+        # the existing String column to avoid BigInteger signedness juggling.
+        stable = {k: v for k, v in payload.items() if k not in cls._VOLATILE_PAYLOAD_KEYS}
+        return format(xxhash.xxh3_64_intdigest(orjson.dumps(stable, option=orjson.OPT_SORT_KEYS)), "016x")
+
+    _DIALECT_INSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+    def _upsert_payload_row(self, db, model_cls, trip_id: str, values: dict) -> None:
+        """Write a payload row in one INSERT ... ON CONFLICT DO UPDATE statement.
+
+        Avoids the get-then-update pattern that reads the (potentially large)
+        existing JSON payload back just to overwrite it.
+        """
+        insert_fn = self._DIALECT_INSERTS.get(db.get_bind().dialect.name)
+        if insert_fn is None:
+            # Dialects without native upsert fall back to ORM merge semantics.
+            db.merge(model_cls(trip_id=trip_id, **values))
+            return
+        stmt = insert_fn(model_cls).values(trip_id=trip_id, **values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["trip_id"],
+            set_={key: getattr(stmt.excluded, key) for key in values},
+        )
+        db.execute(stmt)
 
     def save_itinerary(self, trip_id: str, itinerary: ItineraryResult) -> None:
+        # Most Activity optionals are None; exclude_none avoids materializing
+        # them in the payload (model_construct restores defaults on read).
+        payload = _ITINERARY_ADAPTER.dump_python(itinerary, exclude_none=True)
+        payload_hash = self._payload_hash(payload)
         with self.session() as db:
-            model = db.get(ItineraryModel, trip_id)
-            payload = itinerary.model_dump()
-            if model:
-                model.generated_at = itinerary.generated_at
-                model.payload = payload
-            else:
-                db.add(
-                    ItineraryModel(
-                        trip_id=trip_id,
-                        generated_at=itinerary.generated_at,
-                        payload=payload,
-                    )
-                )
+            # Fetch only the stored hash; skip the write entirely when the
+            # regenerated payload carries identical content.
+            existing = db.execute(
+                select(ItineraryModel.payload_hash).where(ItineraryModel.trip_id == trip_id)
+            ).first()
+            if existing and existing[0] == payload_hash:
+                return
+            self._upsert_payload_row(
+                db,
+                ItineraryModel,
+                trip_id,
+                {
+                    "generated_at": itinerary.generated_at,
+                    "payload": payload,
+                    "payload_hash": payload_hash,
+                },
+            )
 
     def get_itinerary(self, trip_id: str) -> Optional[ItineraryResult]:
         with self.session() as db:
-            model = db.execute(select(ItineraryModel).where(ItineraryModel.trip_id == trip_id)).scalar_one_or_none()
+            # PK lookup: db.get skips statement construction/compilation and can
+            # hit the identity map within a request-scoped session.
+            model = db.get(ItineraryModel, trip_id)
             if not model:
                 return None
-            return ItineraryResult.model_validate(model.payload)
+            return _trusted_reconstruct(ItineraryResult, model.payload)
 
     def save_draft_plan(self, trip_id: str, draft_plan: DraftPlan) -> DraftPlan:
+        payload = _DRAFT_PLAN_ADAPTER.dump_python(draft_plan, exclude_none=True)
+        payload_hash = self._payload_hash(payload)
         with self.session() as db:
-            model = db.get(DraftPlanModel, trip_id)
-            payload = draft_plan.model_dump()
-            if model:
-                model.saved_at = draft_plan.saved_at
-                model.payload = payload
-            else:
-                db.add(
-                    DraftPlanModel(
-                        trip_id=trip_id,
-                        saved_at=draft_plan.saved_at,
-                        payload=payload,
-                    )
-                )
+            existing = db.execute(
+                select(DraftPlanModel.payload_hash).where(DraftPlanModel.trip_id == trip_id)
+            ).first()
+            if existing and existing[0] == payload_hash:
+                return draft_plan
+            self._upsert_payload_row(
+                db,
+                DraftPlanModel,
+                trip_id,
+                {
+                    "saved_at": draft_plan.saved_at,
+                    "payload": payload,
+                    "payload_hash": payload_hash,
+                },
+            )
         return draft_plan
 
     def get_draft_plan(self, trip_id: str) -> Optional[DraftPlan]:
         with self.session() as db:
-            model = db.execute(select(DraftPlanModel).where(DraftPlanModel.trip_id == trip_id)).scalar_one_or_none()
+            model = db.get(DraftPlanModel, trip_id)
             if not model:
                 return None
-            return DraftPlan.model_validate(model.payload)
+            return _trusted_reconstruct(DraftPlan, model.payload)
 
     def save_planning_settings(self, trip_id: str, settings: PlanningSettings) -> PlanningSettings:
         with self.session() as db:
@@ -158,16 +374,14 @@ class SqlRepository:
 
     def get_planning_settings(self, trip_id: str) -> Optional[PlanningSettings]:
         with self.session() as db:
-            model = db.execute(
-                select(TripPlanningSettingsModel).where(TripPlanningSettingsModel.trip_id == trip_id)
-            ).scalar_one_or_none()
+            model = db.get(TripPlanningSettingsModel, trip_id)
             if not model:
                 return None
             return PlanningSettings.model_validate(model.payload)
 
     def touch_share_token(self, trip_id: str) -> Optional[str]:
         with self.session() as db:
-            model = db.execute(select(DraftPlanModel).where(DraftPlanModel.trip_id == trip_id)).scalar_one_or_none()
+            model = db.get(DraftPlanModel, trip_id)
             if not model:
                 return None
             payload = dict(model.payload or {})
@@ -180,6 +394,7 @@ class SqlRepository:
             metadata["shared_at"] = datetime.utcnow().isoformat()
             payload["metadata"] = metadata
             model.payload = payload
+            model.payload_hash = self._payload_hash(payload)
             model.saved_at = payload.get("saved_at") or model.saved_at
             return token
 
@@ -194,30 +409,10 @@ class SqlRepository:
                 metadata = payload.get("metadata") or {}
                 if str(metadata.get("shared_token") or "") != token:
                     continue
-                trip_model = db.get(TripModel, model.trip_id)
+                trip_model = self._get_trip_with_participants(db, model.trip_id)
                 if not trip_model:
                     continue
-                participants = [
-                    Participant(
-                        trip_id=p.trip_id,
-                        name=p.name,
-                        interest_vector=p.interest_vector,
-                        schedule_preference=p.schedule_preference,
-                        wake_preference=p.wake_preference,
-                    )
-                    for p in trip_model.participants
-                ]
-                trip = Trip(
-                    id=trip_model.id,
-                    destination=trip_model.destination,
-                    start_date=trip_model.start_date,
-                    end_date=trip_model.end_date,
-                    accommodation_address=getattr(trip_model, "accommodation_address", "") or "",
-                    accommodation_lat=trip_model.accommodation_lat,
-                    accommodation_lng=trip_model.accommodation_lng,
-                    participants=participants,
-                )
-                return trip, DraftPlan.model_validate(payload)
+                return self._trip_from_model(trip_model), _DRAFT_PLAN_ADAPTER.validate_python(payload)
         return None
 
     def analytics_summary(self) -> AnalyticsSummary:
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from datetime import date
 from enum import Enum
-from typing import Dict, List, Optional
+from functools import cached_property
+from typing import Dict, Final, List, Optional, Tuple
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -19,7 +20,7 @@ class WakePreference(str, Enum):
     late = "late"
 
 
-INTEREST_KEYS = ["food", "nightlife", "culture", "outdoors", "relaxation"]
+INTEREST_KEYS: Final[tuple[str, ...]] = ("food", "nightlife", "culture", "outdoors", "relaxation")
 MAX_TRIP_DAYS = 30
 
 
@@ -31,7 +32,16 @@ class InterestVector(BaseModel):
     relaxation: float = Field(ge=0, le=5)
 
     def as_dict(self) -> Dict[str, float]:
-        return {k: float(getattr(self, k)) for k in INTEREST_KEYS}
+        # Direct attribute reads; fields are already validated floats, so the
+        # getattr/float() loop over INTEREST_KEYS is avoidable overhead on the
+        # per-participant scoring path.
+        return {
+            "food": self.food,
+            "nightlife": self.nightlife,
+            "culture": self.culture,
+            "outdoors": self.outdoors,
+            "relaxation": self.relaxation,
+        }
 
 
 class CreateTripRequest(BaseModel):
@@ -46,10 +56,12 @@ class CreateTripRequest(BaseModel):
     @classmethod
     def validate_dates(cls, v: date, info):
         start = info.data.get("start_date")
-        if start and v < start:
-            raise ValueError("end_date must be on or after start_date")
-        if start and ((v - start).days + 1) > MAX_TRIP_DAYS:
-            raise ValueError(f"trip length must be at most {MAX_TRIP_DAYS} days")
+        if start:
+            day_count = (v - start).days + 1
+            if day_count < 1:
+                raise ValueError("end_date must be on or after start_date")
+            if day_count > MAX_TRIP_DAYS:
+                raise ValueError(f"trip length must be at most {MAX_TRIP_DAYS} days")
         return v
 
     @field_validator("accommodation_lat")
@@ -200,6 +212,11 @@ class DraftPlanMetadata(BaseModel):
     shared_count: int = Field(default=0, ge=0)
     shared_at: Optional[str] = None
 
+    @cached_property
+    def feedback_by_key(self) -> Dict[Tuple[str, str], DraftSlotFeedback]:
+        """O(1) lookup of feedback by (slot_id, candidate_name) instead of scanning the list."""
+        return {(feedback.slot_id, feedback.candidate_name): feedback for feedback in self.slot_feedback}
+
 
 class DraftPlanSaveRequest(BaseModel):
     selections: List[DraftSelection] = Field(min_length=1)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+# In-memory SQLite: no file I/O or fsync per commit, and app.db pins the
+# engine to one shared connection via StaticPool. Each pytest-xdist worker
+# is its own process, so every worker naturally gets an isolated database.
+os.environ["DATABASE_URL"] = "sqlite://"
+
+from app.db import Base, engine
+from app.engine import ItineraryEngine
+from app.main import app
+from app.places_client import GooglePlacesClient
+
+
+@pytest.fixture(scope="session")
+def client(create_schema):
+    # One TestClient for the whole session: lifespan startup/shutdown and
+    # engine initialization run once instead of per test.
+    with TestClient(app) as session_client:
+        # Build the (lazily generated) OpenAPI schema and warm the router in
+        # fixture setup so the first test doesn't absorb the cost.
+        app.openapi()
+        session_client.get("/docs")
+        yield session_client
+
+
+def _fake_geocode(query: str, google_api_key: str | None, limit: int) -> list[dict]:
+    return [
+        {
+            "address": "1600 Amphitheatre Pkwy, Mountain View, CA 94043, USA",
+            "lat": 37.422,
+            "lng": -122.084,
+            "provider": "google_geocoding",
+            "confidence": 1.0,
+        }
+    ]
+
+
+@pytest.fixture(scope="session", autouse=True)
+def stub_geocode():
+    # No test should reach the real geocoding provider; pin one canned
+    # candidate for the whole session instead of monkeypatching per test.
+    from app import main
+
+    real_geocode = main.geocode_address
+    main.geocode_address = _fake_geocode
+    yield
+    main.geocode_address = real_geocode
+
+
+@pytest.fixture(scope="session", autouse=True)
+def cached_fetch_activities():
+    # Endpoint tests regenerate itineraries for the same destinations over
+    # and over; cache _fetch_activities results per (destination, lat, lng)
+    # for the session. Tests that install their own fake Places client
+    # (test_fetch_activities_*) bypass the cache so they exercise the real
+    # fetch path. The engine never mutates activities in place (it uses
+    # model_copy), so sharing the cached lists is safe.
+    real_fetch = ItineraryEngine._fetch_activities
+    cache: dict[tuple[str, float, float], list] = {}
+
+    def fetch(self, destination: str, base_lat: float, base_lng: float):
+        default_client = self.google_places_client is None or isinstance(
+            self.google_places_client, GooglePlacesClient
+        )
+        if not default_client:
+            return real_fetch(self, destination, base_lat, base_lng)
+        key = (destination, base_lat, base_lng)
+        if key not in cache:
+            cache[key] = real_fetch(self, destination, base_lat, base_lng)
+        return list(cache[key])
+
+    ItineraryEngine._fetch_activities = fetch
+    yield
+    ItineraryEngine._fetch_activities = real_fetch
+
+
+@pytest.fixture(scope="session", autouse=True)
+def create_schema():
+    # DDL runs once per session; the in-memory database is known-empty, so
+    # checkfirst=False skips the per-table existence introspection.
+    Base.metadata.create_all(bind=engine, checkfirst=False)
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_database(create_schema):
+    # Each test starts from empty tables so tests stay order-independent
+    # while sharing the session-scoped client. Row deletes instead of
+    # drop_all/create_all: the app commits its own request-scoped sessions,
+    # so transaction/savepoint rollback can't undo its writes, but DELETE
+    # against the in-memory database is far cheaper than re-running DDL.
+    yield
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
@@ -0,0 +1,140 @@
+"""Run all CORS probes against the deployed backend concurrently.
+
+Consolidates the test_cors*.py scripts: each probe is a row in CASES and
+they all fly in parallel, so total wall time is one round-trip to Render
+instead of the sum of them.
+"""
+import asyncio
+import socket
+import ssl
+import sys
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+import httpx
+
+BASE_URL = "https://planner-h514.onrender.com"
+VERCEL_ORIGIN = "https://planner-sepia-alpha.vercel.app"
+MISSING_TRIP_ID = "ae2c6669-2bd6-475a-a9c6-1674059e044f"
+
+# (label, method, url, headers) — expect 404/401 responses; the point is
+# the Access-Control-* headers that come back with them.
+CASES = [
+    (
+        "GET itinerary, vercel origin",
+        "GET",
+        f"{BASE_URL}/trip/{MISSING_TRIP_ID}/itinerary",
+        {"Origin": VERCEL_ORIGIN},
+    ),
+    (
+        "POST join, vercel origin",
+        "POST",
+        f"{BASE_URL}/trip/{MISSING_TRIP_ID}/join",
+        {"Origin": VERCEL_ORIGIN},
+    ),
+    (
+        "GET trip, vercel origin",
+        "GET",
+        f"{BASE_URL}/trip/{MISSING_TRIP_ID}",
+        {"Origin": VERCEL_ORIGIN},
+    ),
+    (
+        "GET trip, fake token",
+        "GET",
+        f"{BASE_URL}/trip/fake-trip-id",
+        {"Origin": VERCEL_ORIGIN, "X-Trip-Token": "fake-token"},
+    ),
+    (
+        "GET itinerary, arbitrary origin",
+        "GET",
+        f"{BASE_URL}/trip/{MISSING_TRIP_ID}/itinerary",
+        {"Origin": "https://arbitrary-domain.com"},
+    ),
+    (
+        "GET trip, lowercase token header",
+        "GET",
+        f"{BASE_URL}/trip/696bab42-c280-404c-8457-b2bcab82f3b4",
+        {"Origin": VERCEL_ORIGIN, "x-trip-token": "token"},
+    ),
+]
+
+
+try:  # HTTP/2 lets the concurrent probes multiplex one connection; httpx
+    import h2  # noqa: F401  # needs the optional h2 package for it.
+
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+# Load and parse the CA bundle exactly once; every connection the client
+# opens shares this context (and with it OpenSSL's session cache).
+SSL_CONTEXT = ssl.create_default_context()
+
+# One keep-alive client for every probe: urllib opened a fresh TCP+TLS
+# connection per request, paying a WAN handshake each time; the pooled
+# client reuses the socket and TLS session across all six. Only status and
+# headers matter, so redirects are not followed.
+client = httpx.Client(timeout=30.0, follow_redirects=False, http2=_HTTP2, verify=SSL_CONTEXT)
+
+
+def probe(label: str, method: str, url: str, headers: dict) -> tuple[str, int, str]:
+    # stream() closes the response without downloading the 404/401 error
+    # body Render attaches; status and headers arrive with the first frame.
+    with client.stream(method, url, headers=headers) as resp:
+        header_lines = "\n".join(f"{name}: {value}" for name, value in resp.headers.items())
+        return label, resp.status_code, header_lines
+
+
+@lru_cache(maxsize=None)
+def preflight(origin: str, method: str) -> str:
+    # The Access-Control-* headers under test come back on OPTIONS; one
+    # preflight per (origin, method) pair covers every path that shares it.
+    resp = client.options(
+        f"{BASE_URL}/trip/{MISSING_TRIP_ID}",
+        headers={
+            "Origin": origin,
+            "Access-Control-Request-Method": method,
+            "Access-Control-Request-Headers": "x-trip-token,content-type",
+        },
+    )
+    cors_headers = "\n".join(
+        f"{name}: {value}"
+        for name, value in resp.headers.items()
+        if name.lower().startswith("access-control-")
+    )
+    return f"status {resp.status_code}\n{cors_headers}"
+
+
+def prewarm_dns() -> None:
+    # Resolve the Render hostname once up front so the concurrent probes
+    # don't each fire their own getaddrinfo against a short-TTL record.
+    try:
+        socket.getaddrinfo(urlsplit(BASE_URL).hostname, 443, proto=socket.IPPROTO_TCP)
+    except OSError:
+        pass  # probes will surface the connection error with context
+
+
+async def main() -> None:
+    # One preflight per distinct (origin, method) and one actual request per
+    # distinct (method, path); the client blocks, so everything runs in
+    # worker threads and gather overlaps the network waits.
+    prewarm_dns()
+    preflight_keys = list(dict.fromkeys((case[3]["Origin"], case[1]) for case in CASES))
+    unique_cases = list({(case[1], case[2]): case for case in CASES}.values())
+
+    preflight_results, probe_results = await asyncio.gather(
+        asyncio.gather(*(asyncio.to_thread(preflight, *key) for key in preflight_keys)),
+        asyncio.gather(*(asyncio.to_thread(probe, *case) for case in unique_cases)),
+    )
+
+    # One buffered write instead of a flush per print.
+    lines = [
+        f"preflight {method} from {origin}: {result}"
+        for (origin, method), result in zip(preflight_keys, preflight_results)
+    ]
+    lines.extend(f"{label}: status {status}\n{headers}" for label, status, headers in probe_results)
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())